@@ -5,8 +5,14 @@ from importlib.metadata import version
 
 import logging
 import os
+from typing import Optional
 
-from jinja2 import Environment, PackageLoader, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    PackageLoader,
+    select_autoescape,
+)
 from rich.logging import RichHandler
 
 from .hook import Hook
@@ -16,6 +22,7 @@ __version__ = version("agent-evaluation")
 
 
 _LOG_LEVEL_ENV = "LOG_LEVEL"
+_CACHE_HOME_ENV = "XDG_CACHE_HOME"
 
 
 def configure_logger():
@@ -35,6 +42,29 @@ def configure_logger():
 
 configure_logger()
 
+
+def get_jinja_cache_dir() -> str:
+    cache_home = os.environ.get(_CACHE_HOME_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "agenteval", "jinja")
+
+
+def create_bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    # persist compiled templates across runs, if the cache directory is writable
+    cache_dir = get_jinja_cache_dir()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        return None
+
+    # the directory may exist without being writable, e.g. if created by another user
+    if not os.access(cache_dir, os.W_OK):
+        return None
+
+    return FileSystemBytecodeCache(directory=cache_dir)
+
+
 jinja_env = Environment(
     loader=PackageLoader(__name__),
     autoescape=select_autoescape(
@@ -42,4 +72,7 @@ jinja_env = Environment(
         default_for_string=True,
         default=True,
     ),
+    bytecode_cache=create_bytecode_cache(),
+    # templates are packaged, so they do not change while running
+    auto_reload=False,
 )
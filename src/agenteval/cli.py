@@ -8,12 +8,13 @@ from typing import Optional
 import click
 
 from agenteval.plan import Plan
-from agenteval.plan.exceptions import TestFailureError
+from agenteval.plan.exceptions import InvalidConfigurationError, TestFailureError
 
 
 class ExitCode(Enum):
     TESTS_FAILED = 1
     PLAN_ALREADY_EXISTS = 2
+    INVALID_CONFIGURATION = 3
 
 
 def validate_directory(ctx, param, value):
@@ -115,3 +116,5 @@ def run(
 
     except TestFailureError:
         exit(ExitCode.TESTS_FAILED.value)
+    except InvalidConfigurationError:
+        exit(ExitCode.INVALID_CONFIGURATION.value)
@@ -12,6 +12,7 @@ class Conversation:
     Attributes:
         messages (list): A list of tuples of the form (role, message).
         turns (int): The number of turns in the conversation.
+        transcript (str): The messages formatted as `"ROLE: message"` lines.
     """
 
     def __init__(self):
@@ -20,6 +21,8 @@ class Conversation:
         """
         self.messages = []
         self.turns = _START_TURN_COUNT
+        # built as turns are added, so it does not need to be re-rendered
+        self.transcript = ""
 
     def __iter__(self):
         return iter(self.messages)
@@ -34,4 +37,5 @@ class Conversation:
         Increments the `turn` counter by `1`.
         """
         self.messages.extend([(_USER, user_message), (_AGENT, agent_response)])
+        self.transcript += f"{_USER}: {user_message}\n{_AGENT}: {agent_response}\n"
         self.turns += 1
@@ -6,3 +6,10 @@ MAX_TURNS = 2
 # Default max number of threads not exceeding Bedrock service quota:
 # https://docs.aws.amazon.com/bedrock/latest/userguide/quotas.html
 MAX_NUM_THREADS = 45
+
+# Number of connections in the pool shared by evaluators per thread, allowing each
+# test to have an additional model invocation in flight
+POOL_CONNECTIONS_PER_THREAD = 2
+
+# Default size of the connection pool shared by evaluators
+MAX_POOL_CONNECTIONS = POOL_CONNECTIONS_PER_THREAD * MAX_NUM_THREADS
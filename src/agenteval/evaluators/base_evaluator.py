@@ -2,15 +2,17 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Union
 
+from agenteval import defaults
 from agenteval.conversation import Conversation
 from agenteval.hook import Hook
 from agenteval.targets import BaseTarget
 from agenteval.test import Test, TestResult
 from agenteval.trace import Trace
-from agenteval.utils import create_boto3_client, import_class
+from agenteval.utils import get_shared_boto3_client, import_class
 
 _BOTO3_SERVICE_NAME = "bedrock-runtime"
 
@@ -30,6 +32,7 @@ class BaseEvaluator(ABC):
         model_id (str): The ID of the Bedrock model used to run evaluation. If `provisioned_throughput_arn` is provided,
             then this will be set to the ARN of the provisioned throughput.
         boto3_client (BaseClient): A `boto3` client representing Amazon Bedrock Runtime.
+            The client is shared by evaluators with the same AWS configuration.
     """
 
     def __init__(
@@ -44,6 +47,7 @@ class BaseEvaluator(ABC):
         aws_region: Optional[str] = None,
         endpoint_url: Optional[str] = None,
         max_retry: int = 10,
+        max_pool_connections: int = defaults.MAX_POOL_CONNECTIONS,
     ):
         """Initialize the evaluator.
 
@@ -58,6 +62,8 @@ class BaseEvaluator(ABC):
             aws_region (Optional[str]): The AWS region.
             endpoint_url (Optional[str]): The endpoint URL for the AWS service.
             max_retry (int): The maximum number of retry attempts.
+            max_pool_connections (int): The maximum number of connections kept in
+                the pool of the shared `boto3` client.
         """
         self.test = test
         self.target = target
@@ -66,13 +72,15 @@ class BaseEvaluator(ABC):
         self.test_result = None
         self.input_token_count = 0
         self.output_token_count = 0
+        self._token_count_lock = threading.Lock()
         self.model_id = provisioned_throughput_arn or model_id
-        self.bedrock_runtime_client = create_boto3_client(
+        self.bedrock_runtime_client = get_shared_boto3_client(
             boto3_service_name=_BOTO3_SERVICE_NAME,
             aws_profile=aws_profile,
             aws_region=aws_region,
             endpoint_url=endpoint_url,
             max_retry=max_retry,
+            max_pool_connections=max_pool_connections,
         )
 
     @abstractmethod
@@ -89,22 +97,27 @@ class BaseEvaluator(ABC):
             hook_cls = import_class(hook, parent_class=Hook)
             return hook_cls
 
-    def invoke_model(self, request_body: dict) -> dict:
+    def invoke_model(self, request_body: Union[dict, str]) -> dict:
         """
         Invoke the Bedrock model using the `boto3_client`. This method will convert
         a request dictionary to a JSON string before passing it to the `InvokeModel` API.
+        A request that is already serialized is passed as is.
 
         Refer to the `boto3` documentation for more details.
 
         Args:
-            request_body (dict): The request payload as a dictionary.
+            request_body (Union[dict, str]): The request payload as a dictionary or
+                a JSON string.
 
         Returns:
             dict: The response from the model invocation.
 
         """
+        if isinstance(request_body, dict):
+            request_body = json.dumps(request_body)
+
         response = self.bedrock_runtime_client.invoke_model(
-            modelId=self.model_id, body=json.dumps(request_body)
+            modelId=self.model_id, body=request_body
         )
 
         self._incr_token_counts(response)
@@ -114,12 +127,14 @@ class BaseEvaluator(ABC):
     def _incr_token_counts(self, response: dict):
         headers = response["ResponseMetadata"]["HTTPHeaders"]
 
-        self.input_token_count += int(
-            headers.get("x-amzn-bedrock-input-token-count", 0)
-        )
-        self.output_token_count += int(
-            headers.get("x-amzn-bedrock-output-token-count", 0)
-        )
+        # the model may be invoked concurrently by the same evaluator
+        with self._token_count_lock:
+            self.input_token_count += int(
+                headers.get("x-amzn-bedrock-input-token-count", 0)
+            )
+            self.output_token_count += int(
+                headers.get("x-amzn-bedrock-output-token-count", 0)
+            )
 
     def run(self) -> TestResult:
         """
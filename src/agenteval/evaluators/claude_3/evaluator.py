@@ -1,11 +1,13 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import concurrent.futures
 import json
 import logging
-import os
-import re
-from typing import Tuple
+import random
+import sys
+import time
+from typing import Callable, Optional, Tuple
 
 from agenteval import jinja_env
 from agenteval.evaluators import BaseEvaluator
@@ -22,6 +24,25 @@ _PROMPT_TEMPLATE_NAMES = [
     "generate_test_status",
     "generate_evaluation",
 ]
+# maps each template name to its rendered system prompt and prompt template;
+# system prompts do not depend on the test, so they are only rendered once
+_PROMPT_TEMPLATE_MAP = {
+    name: (
+        jinja_env.get_template(
+            f"{_PROMPT_TEMPLATE_ROOT}/{_SYSTEM_PROMPT_DIR}/{name}.jinja"
+        ).render(),
+        jinja_env.get_template(f"{_PROMPT_TEMPLATE_ROOT}/{name}.jinja"),
+    )
+    for name in _PROMPT_TEMPLATE_NAMES
+}
+# the static request body fields are serialized once and reused for every request
+_REQUEST_BODY_STATIC_JSON = json.dumps(model_configs.REQUEST_BODY_STATIC)[1:-1]
+_ROLE_JSON = json.dumps(model_configs.ROLE)
+
+_MAX_RETRIES = 4
+_RETRY_BACKOFF_BASE = 0.5
+_RETRY_BACKOFF_CAP = 8
+_RETRY_BACKOFF_JITTER = 0.5
 
 BLUE = '\033[94m'
 GREEN = '\033[92m'
@@ -43,6 +64,20 @@ except ImportError:
         pass
 
 
+def _extract_xml_element(xml_data: str, element_name: str) -> Optional[str]:
+    start_tag = f"<{element_name}>"
+    start = xml_data.find(start_tag)
+    if start < 0:
+        return None
+    start += len(start_tag)
+
+    end = xml_data.find(f"</{element_name}>", start)
+    if end < 0:
+        return None
+
+    return xml_data[start:end].strip()
+
+
 class TestStatusCategories(StrEnum):
     ALL_STEPS_ATTEMPTED = "A"
     NOT_ALL_STEPS_ATTEMPTED = "B"
@@ -63,6 +98,15 @@ class Results(StrEnum):
     )
 
 
+# raw values used during evaluation, which avoid going through the enums every turn
+_CAT_ALL_STEPS = TestStatusCategories.ALL_STEPS_ATTEMPTED.value
+_CAT_ALL_OBS = EvaluationCategories.ALL_EXPECTED_RESULTS_OBSERVED.value
+_CAT_NOT_ALL_OBS = EvaluationCategories.NOT_ALL_EXPECTED_RESULTS_OBSERVED.value
+_RESULT_MAX_TURNS = Results.MAX_TURNS_REACHED.value
+_RESULT_ALL_OBS = Results.ALL_EXPECTED_RESULTS_OBSERVED.value
+_RESULT_NOT_ALL_OBS = Results.NOT_ALL_EXPECTED_RESULTS_OBSERVED.value
+
+
 class Claude3Evaluator(BaseEvaluator):
     """An evaluator powered by Claude 3."""
 
@@ -73,62 +117,55 @@ class Claude3Evaluator(BaseEvaluator):
         """Initialize the evaluator."""
         super().__init__(model_id=model_configs.MODEL_ID, **kwargs)
 
-        self._prompt_template_map = {
-            name: {
-                "system": jinja_env.get_template(
-                    os.path.join(
-                        _PROMPT_TEMPLATE_ROOT, _SYSTEM_PROMPT_DIR, f"{name}.jinja"
-                    )
-                ),
-                "prompt": jinja_env.get_template(
-                    os.path.join(_PROMPT_TEMPLATE_ROOT, f"{name}.jinja")
-                ),
-            }
-            for name in _PROMPT_TEMPLATE_NAMES
-        }
+        self._prompt_template_map = _PROMPT_TEMPLATE_MAP
 
     @staticmethod
     def _extract_content_from_xml(xml_data: str, element_names: list[str]) -> Tuple:
-        content = []
-        for e in element_names:
-            pattern = rf"<{e}>(.*?)</{e}>"
-            match = re.search(pattern, xml_data, re.DOTALL)
-            content.append(match.group(1).strip() if match else None)
-        return tuple(content)
+        return tuple(_extract_xml_element(xml_data, e) for e in element_names)
 
     def _generate(
         self,
         system_prompt: str,
         prompt: str,
         output_xml_element: str,
-    ) -> str:
-        request_body = model_configs.REQUEST_BODY
-        request_body["system"] = system_prompt
-        request_body["messages"][0]["content"][0]["text"] = prompt
+        extract_reasoning: bool = False,
+    ) -> tuple[Optional[str], Optional[str]]:
+        request_body = (
+            '{"system": '
+            + json.dumps(system_prompt)
+            + ', "messages": [{"role": '
+            + _ROLE_JSON
+            + ', "content": [{"type": "text", "text": '
+            + json.dumps(prompt)
+            + "}]}], "
+            + _REQUEST_BODY_STATIC_JSON
+            + "}"
+        )
 
         response = self.invoke_model(request_body=request_body)
-        response_body = response.get("body").read()
-        completion = json.loads(response_body)["content"][0]["text"]
+        completion = json.load(response["body"])["content"][0]["text"]
 
         logger.debug(
             f"[{self.test.name}]\n[PROMPT]\n{prompt}\n[COMPLETION]\n{completion}"
         )
 
-        output, reasoning = self._extract_content_from_xml(
-            completion, [output_xml_element, "thinking"]
-        )
+        # the reasoning is only extracted for callers that use it
+        if extract_reasoning:
+            return self._extract_content_from_xml(
+                completion, [output_xml_element, "thinking"]
+            )
 
-        return output, reasoning
+        (output,) = self._extract_content_from_xml(completion, [output_xml_element])
+
+        return output, None
 
     def _generate_initial_prompt(self) -> str:
-        system_prompt = self._prompt_template_map["generate_initial_prompt"][
-            "system"
-        ].render()
-        prompt = self._prompt_template_map["generate_initial_prompt"]["prompt"].render(
-            step=self.test.steps[0]
-        )
+        system_prompt, prompt_template = self._prompt_template_map[
+            "generate_initial_prompt"
+        ]
+        prompt = prompt_template.render(step=self.test.steps[0])
 
-        initial_prompt, reasoning = self._generate(
+        initial_prompt, _ = self._generate(
             system_prompt=system_prompt,
             prompt=prompt,
             output_xml_element="initial_prompt",
@@ -138,18 +175,24 @@ class Claude3Evaluator(BaseEvaluator):
             system_prompt=system_prompt,
             prompt=prompt,
             initial_prompt=initial_prompt,
-            reasoning=reasoning,
         )
         return initial_prompt
 
     def _generate_test_status(self) -> str:
-        system_prompt = self._prompt_template_map["generate_test_status"][
-            "system"
-        ].render()
-        prompt = self._prompt_template_map["generate_test_status"]["prompt"].render(
-            steps=self.test.steps, conversation=self.conversation
+        if len(self.test.steps) == 1:
+            # the only step is attempted by the first user message
+            test_status = _CAT_ALL_STEPS
+            self.trace.add_step(test_status=test_status)
+            return test_status
+
+        system_prompt, prompt_template = self._prompt_template_map[
+            "generate_test_status"
+        ]
+        prompt = prompt_template.render(
+            steps=self.test.steps,
+            conversation_transcript=self.conversation.transcript,
         )
-        test_status, reasoning = self._generate(
+        test_status, _ = self._generate(
             system_prompt=system_prompt,
             prompt=prompt,
             output_xml_element="category",
@@ -158,23 +201,29 @@ class Claude3Evaluator(BaseEvaluator):
             system_prompt=system_prompt,
             prompt=prompt,
             test_status=test_status,
-            reasoning=reasoning,
         )
         return test_status
 
     def _generate_evaluation(self) -> tuple[str, str]:
-        system_prompt = self._prompt_template_map["generate_evaluation"][
-            "system"
-        ].render()
-        prompt = self._prompt_template_map["generate_evaluation"]["prompt"].render(
+        if not self.test.expected_results:
+            # there are no expected results to observe
+            evaluation = _CAT_ALL_OBS
+            self.trace.add_step(evaluation=evaluation)
+            return evaluation, ""
+
+        system_prompt, prompt_template = self._prompt_template_map[
+            "generate_evaluation"
+        ]
+        prompt = prompt_template.render(
             expected_results=self.test.expected_results,
-            conversation=self.conversation,
+            conversation_transcript=self.conversation.transcript,
         )
 
         evaluation, reasoning = self._generate(
             system_prompt=system_prompt,
             prompt=prompt,
             output_xml_element="category",
+            extract_reasoning=True,
         )
         self.trace.add_step(
             system_prompt=system_prompt,
@@ -185,26 +234,37 @@ class Claude3Evaluator(BaseEvaluator):
 
         return evaluation, reasoning
 
-    def _generate_user_response(self) -> str:
-        system_prompt = self._prompt_template_map["generate_user_response"][
-            "system"
-        ].render()
-        prompt = self._prompt_template_map["generate_user_response"]["prompt"].render(
-            steps=self.test.steps, conversation=self.conversation
+    def _request_user_response(self) -> tuple[str, str, Optional[str]]:
+        # does not record a trace step, so it can run speculatively on another thread
+        system_prompt, prompt_template = self._prompt_template_map[
+            "generate_user_response"
+        ]
+        prompt = prompt_template.render(
+            steps=self.test.steps,
+            conversation_transcript=self.conversation.transcript,
         )
 
-        user_response, reasoning = self._generate(
+        user_response, _ = self._generate(
             system_prompt=system_prompt,
             prompt=prompt,
             output_xml_element="user_response",
         )
 
+        return system_prompt, prompt, user_response
+
+    def _add_user_response_step(
+        self, system_prompt: str, prompt: str, user_response: Optional[str]
+    ):
         self.trace.add_step(
+            step_name="_generate_user_response",
             system_prompt=system_prompt,
             prompt=prompt,
             user_response=user_response,
-            reasoning=reasoning,
         )
+
+    def _generate_user_response(self) -> Optional[str]:
+        system_prompt, prompt, user_response = self._request_user_response()
+        self._add_user_response_step(system_prompt, prompt, user_response)
         return user_response
 
     def _invoke_target(self, user_input) -> str:
@@ -213,6 +273,31 @@ class Claude3Evaluator(BaseEvaluator):
 
         return target_response.response
 
+    def _retry_generate(
+        self,
+        generate: Callable[[], Optional[str]],
+        label: str,
+        max_retries: int = _MAX_RETRIES,
+    ) -> Optional[str]:
+        # called after a first attempt did not produce an output
+        output = None
+        n = 0
+        while output is None and n < max_retries:
+            print(
+                f"{BOLD}{YELLOW}WARNING: Falha ao gerar {label}. Tentativa {n+1}/{max_retries}. Turns: {self.conversation.turns}{RESET}"
+            )
+            # exponential backoff with jitter, so throttled requests can recover
+            time.sleep(
+                min(
+                    _RETRY_BACKOFF_BASE * 2**n
+                    + random.uniform(0, _RETRY_BACKOFF_JITTER),  # nosec B311
+                    _RETRY_BACKOFF_CAP,
+                )
+            )
+            output = generate()
+            n += 1
+        return output
+
     def evaluate(self) -> TestResult:
         """Conduct the test.
 
@@ -220,56 +305,78 @@ class Claude3Evaluator(BaseEvaluator):
             TestResult
         """
         passed = False
-        result = Results.MAX_TURNS_REACHED.value
+        result = _RESULT_MAX_TURNS
         reasoning = ""
         print(f"{GREEN}__________________\n* Init test: {self.test.name}{RESET}")
-        while self.conversation.turns < self.test.max_turns:
-            if self.conversation.turns == 0:
-                # start conversation
-                if self.test.initial_prompt:
-                    user_input = self.test.initial_prompt
-                else:
-
-                    user_input = self._generate_initial_prompt()
-                    n = 0
-                    while user_input is None and n < 4:
-                        print(f"{BOLD}{YELLOW}WARNING: Falha ao gerar prompt inicial. Tentativa {n+1}/4. Turns: {self.conversation.turns}{RESET}")
+        next_user_response = None
+        # used to generate the next user response while the test status is pending
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        try:
+            while self.conversation.turns < self.test.max_turns:
+                if self.conversation.turns == 0:
+                    # start conversation
+                    if self.test.initial_prompt:
+                        user_input = self.test.initial_prompt
+                    else:
                         user_input = self._generate_initial_prompt()
-                        n+=1
-            else:
-                # generate next user response
-                user_input = self._generate_user_response()
-                n = 0
-                while user_input is None and n < 4:
-                    print(f"{BOLD}{YELLOW}WARNING: Falha ao gerar resposta do usuário. Tentativa {n+1}/4. Turns: {self.conversation.turns}{RESET}")
-                    user_input = self._generate_user_response()
-                    n+=1
-
-            # add turn to the conversation
-            if user_input is None:
-                print(f"{BOLD}{RED}ERROR: Falha ao gerar resposta do usuário. Tentativa {n+1}/4. Turns: {self.conversation.turns}{RESET}")
-                user_input = "Please repeat your response in the same language."
-            
-            self.conversation.add_turn(user_input, self._invoke_target(user_input))
-            
-            print(f" \n{BLUE}-> Conversation turn {BOLD}{self.conversation.turns}: {RESET}")
-                         
-            print(f"{BG_CYAN}{self.conversation.messages[-2][0]}:{RESET} {self.conversation.messages[-2][1]}\n{BG_MAGENTA}{self.conversation.messages[-1][0]}:{RESET} {self.conversation.messages[-1][1]}")
-            # get test status
-            test_status = self._generate_test_status()
-            if test_status == TestStatusCategories.ALL_STEPS_ATTEMPTED:
-                # evaluate conversation
-                eval_category, reasoning = self._generate_evaluation()
+                        if user_input is None:
+                            user_input = self._retry_generate(
+                                self._generate_initial_prompt, "prompt inicial"
+                            )
+                else:
+                    # collect the next user response generated during the previous
+                    # turn, and only trace it now that it is used
+                    system_prompt, prompt, user_input = next_user_response.result()
+                    self._add_user_response_step(system_prompt, prompt, user_input)
+                    if user_input is None:
+                        user_input = self._retry_generate(
+                            self._generate_user_response, "resposta do usuário"
+                        )
+
+                # add turn to the conversation
+                if user_input is None:
+                    print(
+                        f"{BOLD}{RED}ERROR: Falha ao gerar resposta do usuário. Turns: {self.conversation.turns}{RESET}"
+                    )
+                    user_input = "Please repeat your response in the same language."
+
+                self.conversation.add_turn(user_input, self._invoke_target(user_input))
+
+                # write the turn at once, so it is not interleaved with other tests
+                (user, user_message), (agent, agent_response) = (
+                    self.conversation.messages[-2:]
+                )
+                lines = [
+                    f" \n{BLUE}-> Conversation turn {BOLD}{self.conversation.turns}: {RESET}",
+                    f"{BG_CYAN}{user}:{RESET} {user_message}",
+                    f"{BG_MAGENTA}{agent}:{RESET} {agent_response}",
+                ]
+                sys.stdout.write("\n".join(lines) + "\n")
+
+                # speculatively generate the next user response, as it only depends on
+                # the conversation so far; it is discarded if all steps were attempted
                 if (
-                    eval_category
-                    == EvaluationCategories.NOT_ALL_EXPECTED_RESULTS_OBSERVED.value  # noqa: W503
+                    self.conversation.turns < self.test.max_turns
+                    and len(self.test.steps) > 1  # noqa: W503
                 ):
-                    result = Results.NOT_ALL_EXPECTED_RESULTS_OBSERVED.value
-                else:
-                    result = Results.ALL_EXPECTED_RESULTS_OBSERVED.value
-                    passed = True
-
-                break
+                    next_user_response = executor.submit(self._request_user_response)
+                # get test status
+                test_status = self._generate_test_status()
+                if test_status == _CAT_ALL_STEPS:
+                    # evaluate conversation
+                    eval_category, reasoning = self._generate_evaluation()
+                    if eval_category == _CAT_NOT_ALL_OBS:
+                        result = _RESULT_NOT_ALL_OBS
+                    else:
+                        result = _RESULT_ALL_OBS
+                        passed = True
+
+                    break
+        finally:
+            # a speculative user response which has not started is cancelled, while
+            # one in flight is waited for, so its tokens are counted and it does
+            # not outlive the test
+            executor.shutdown(wait=True, cancel_futures=True)
 
         return TestResult(
             test_name=self.test.name,
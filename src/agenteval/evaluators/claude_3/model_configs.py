@@ -8,18 +8,10 @@ MAX_TOKENS_TO_SAMPLE = 300
 TEMPERATURE = 0
 TOP_K = 250
 TOP_P = 1
-REQUEST_BODY = {
+# request body fields which do not change between invocations
+REQUEST_BODY_STATIC = {
     "anthropic_version": ANTHROPIC_VERSION,
     "max_tokens": MAX_TOKENS_TO_SAMPLE,
-    "system": None,
-    "messages": [
-        {
-            "role": ROLE,
-            "content": [
-                {"type": "text", "text": None},
-            ],
-        }
-    ],
     "temperature": TEMPERATURE,
     "top_p": TOP_P,
     "top_k": TOP_K,
@@ -1,6 +1,8 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+from typing import Optional
+
 from pydantic import BaseModel
 
 from agenteval.evaluators import BaseEvaluator
@@ -19,9 +21,12 @@ class EvaluatorFactory(BaseModel):
     Attributes:
         config: A dictionary containing the configuration parameters
             needed to create a `BaseEvaluator` instance.
+        max_pool_connections: The maximum number of connections kept in the pool
+            of the evaluator's `boto3` client. If `None`, the evaluator default is used.
     """
 
     config: dict
+    max_pool_connections: Optional[int] = None
 
     def create(self, test: Test, target: BaseTarget, work_dir: str, script_name: str) -> BaseEvaluator:
         """Create an instance of the evaluator class specified in the configuration.
@@ -37,12 +42,15 @@ class EvaluatorFactory(BaseModel):
                 parameters applied.
         """
         evaluator_cls = self._get_evaluator_class()
+        kwargs = {k: v for k, v in self.config.items() if k != "model"}
+        if self.max_pool_connections is not None:
+            kwargs["max_pool_connections"] = self.max_pool_connections
         return evaluator_cls(
             test=test,
             target=target,
             work_dir=work_dir,
             script_name=script_name,
-            **{k: v for k, v in self.config.items() if k != "model"}
+            **kwargs,
         )
 
     def _get_evaluator_class(self) -> type[BaseEvaluator]:
@@ -11,3 +11,11 @@ class TestFailureError(Exception):
     def __init__(self, message="One or more tests failed"):
         self.message = message
         super().__init__(self.message)
+
+
+class InvalidConfigurationError(Exception):
+    """An exception raised when a run is configured with an invalid value."""
+
+    def __init__(self, message="Invalid configuration"):
+        self.message = message
+        super().__init__(self.message)
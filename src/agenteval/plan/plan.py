@@ -17,7 +17,7 @@ from rich.progress import Progress
 
 from agenteval import defaults
 from agenteval.evaluators import EvaluatorFactory
-from agenteval.plan.exceptions import TestFailureError
+from agenteval.plan.exceptions import InvalidConfigurationError, TestFailureError
 from agenteval.plan.logging import log_run_end, log_run_start
 from agenteval.summary import create_markdown_summary
 from agenteval.targets import TargetFactory
@@ -39,6 +39,8 @@ _INIT_PLAN = {
     },
 }
 
+_MAX_POOL_CONNECTIONS_ENV = "BEDROCK_MAX_POOL_CONNECTIONS"
+
 
 sys.path.append(".")
 logger = logging.getLogger(__name__)
@@ -120,6 +122,26 @@ class Plan(BaseModel):
             else num_threads
         )
 
+    @staticmethod
+    def _resolve_max_pool_connections(num_threads: int) -> int:
+        value = os.environ.get(_MAX_POOL_CONNECTIONS_ENV)
+        if value is None:
+            return defaults.POOL_CONNECTIONS_PER_THREAD * num_threads
+
+        try:
+            max_pool_connections = int(value)
+        except ValueError:
+            max_pool_connections = 0
+
+        if max_pool_connections < 1:
+            message = (
+                f"{_MAX_POOL_CONNECTIONS_ENV} must be a positive integer, got {value!r}"
+            )
+            logger.error(f"[red]{message}")
+            raise InvalidConfigurationError(message)
+
+        return max_pool_connections
+
     def run(
         self,
         verbose: bool = False,
@@ -182,13 +204,16 @@ class Plan(BaseModel):
     def _setup_run(
         self, filter: Optional[str], work_dir: Optional[str], num_threads: Optional[int]
     ):
-        self._evaluator_factory = EvaluatorFactory(config=self.config["evaluator"])
         self._target_factory = TargetFactory(config=self.config["target"])
         self._test_suite = TestSuite.load(self.config["tests"], filter)
         self._lock = threading.Lock()
         self._num_tests = self._test_suite.num_tests
         self._work_dir = work_dir or os.getcwd()
         self._num_threads = self._resolve_num_threads(self._num_tests, num_threads)
+        self._evaluator_factory = EvaluatorFactory(
+            config=self.config["evaluator"],
+            max_pool_connections=self._resolve_max_pool_connections(self._num_threads),
+        )
         self._results = {test.name: None for test in self._test_suite}
         self._evaluator_input_token_counts = []
         self._evaluator_output_token_counts = []
@@ -1,7 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import concurrent.futures
 import os
+from typing import Optional
 
 from agenteval import jinja_env
 from agenteval.metrics import calculate_pass_rate_metric
@@ -9,6 +11,7 @@ from agenteval.test import Test, TestResult
 
 _TEMPLATE_ROOT = "summary"
 _TEMPLATE_FILE_NAME = "agenteval_summary.md.jinja"
+_TEMPLATE = jinja_env.get_template(f"{_TEMPLATE_ROOT}/{_TEMPLATE_FILE_NAME}")
 
 
 def create_markdown_summary(
@@ -41,21 +44,40 @@ def create_markdown_summary(
     Returns:
         None
     """
-    template = jinja_env.get_template(os.path.join(_TEMPLATE_ROOT, _TEMPLATE_FILE_NAME))
-    
     # Pega o nome do arquivo yml sem a extensão
     base_name = os.path.splitext(plan_file)[0]
     summary_path = os.path.join(work_dir, f"{base_name}_summary.md")
 
     metrics = {"pass_rate": calculate_pass_rate_metric(pass_count, num_tests)}
 
-    rendered = template.render(
+    rendered = _TEMPLATE.render(
         tests=tests, results=test_results, zip=zip, metrics=metrics
     )
 
     _write_summary(summary_path, rendered)
 
 
+def create_markdown_summaries(jobs: list[tuple], max_workers: Optional[int] = None):
+    """
+    Create Markdown summaries for multiple test plans concurrently.
+
+    Rendering is CPU-bound, so the summaries are created in a pool of processes.
+
+    Args:
+        jobs (list[tuple]): A list of argument tuples, each of which is passed to
+            `create_markdown_summary`.
+        max_workers (Optional[int]): The maximum number of processes used. If `None`,
+            the number of processors on the machine will be used.
+
+    Returns:
+        None
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(create_markdown_summary, *job) for job in jobs]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+
 def _write_summary(path: str, summary: str):
-    with open(path, "w+") as f:
+    with open(path, "w", encoding="utf-8") as f:
         f.write(summary)
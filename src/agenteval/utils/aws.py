@@ -1,6 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import threading
 from typing import Optional
 
 import boto3
@@ -8,6 +9,11 @@ from botocore.client import BaseClient
 from botocore.config import Config
 
 _RETRY_MODE = "adaptive"
+# botocore default
+_MAX_POOL_CONNECTIONS = 10
+
+_shared_clients = {}
+_shared_clients_lock = threading.Lock()
 
 
 def create_boto3_client(
@@ -16,6 +22,8 @@ def create_boto3_client(
     aws_region: Optional[str],
     endpoint_url: Optional[str],
     max_retry: int,
+    max_pool_connections: int = _MAX_POOL_CONNECTIONS,
+    tcp_keepalive: bool = False,
 ) -> BaseClient:
     """Create a `boto3` client.
 
@@ -25,12 +33,68 @@ def create_boto3_client(
         aws_region (Optional[str]): The AWS region.
         endpoint_url (Optional[str]): The endpoint URL for the AWS service.
         max_retry (int): The maximum number of retry attempts.
+        max_pool_connections (int): The maximum number of connections kept in
+            the connection pool.
+        tcp_keepalive (bool): Whether to enable TCP keep-alive on the connections.
 
     Returns:
         BaseClient
     """
 
-    config = Config(retries={"max_attempts": max_retry, "mode": _RETRY_MODE})
+    config = Config(
+        retries={"max_attempts": max_retry, "mode": _RETRY_MODE},
+        max_pool_connections=max_pool_connections,
+        tcp_keepalive=tcp_keepalive,
+    )
 
     session = boto3.Session(profile_name=aws_profile, region_name=aws_region)
     return session.client(boto3_service_name, endpoint_url=endpoint_url, config=config)
+
+
+def get_shared_boto3_client(
+    boto3_service_name: str,
+    aws_profile: Optional[str],
+    aws_region: Optional[str],
+    endpoint_url: Optional[str],
+    max_retry: int,
+    max_pool_connections: int = _MAX_POOL_CONNECTIONS,
+) -> BaseClient:
+    """Get a `boto3` client which is shared by all callers using the same configuration.
+
+    `boto3` clients are thread-safe, so sharing a client allows concurrent callers
+    to reuse the connections in its pool. The client is created on first use, with
+    TCP keep-alive enabled so pooled connections stay open between calls.
+
+    Args:
+        boto3_service_name (str): The `boto3` service name (e.g `"bedrock-runtime"`).
+        aws_profile (Optional[str]): The AWS profile name.
+        aws_region (Optional[str]): The AWS region.
+        endpoint_url (Optional[str]): The endpoint URL for the AWS service.
+        max_retry (int): The maximum number of retry attempts.
+        max_pool_connections (int): The maximum number of connections kept in
+            the connection pool.
+
+    Returns:
+        BaseClient
+    """
+    key = (
+        boto3_service_name,
+        aws_profile,
+        aws_region,
+        endpoint_url,
+        max_retry,
+        max_pool_connections,
+    )
+
+    with _shared_clients_lock:
+        if key not in _shared_clients:
+            _shared_clients[key] = create_boto3_client(
+                boto3_service_name=boto3_service_name,
+                aws_profile=aws_profile,
+                aws_region=aws_region,
+                endpoint_url=endpoint_url,
+                max_retry=max_retry,
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=True,
+            )
+        return _shared_clients[key]
@@ -1,9 +1,12 @@
 import io
+import json
+import threading
+import time
 
 import pytest
 
+from src.agenteval import defaults
 from src.agenteval.evaluators.claude_3 import evaluator
-from src.agenteval.utils import aws
 from src.agenteval.test import Test
 
 
@@ -24,10 +27,17 @@ def target_fixture(mocker):
 
 
 @pytest.fixture
-def evaluator_fixture(mocker, test_fixture, target_fixture):
-    mock_session = mocker.patch.object(aws.boto3, "Session")
-    mocker.patch.object(mock_session.return_value, "client")
+def get_shared_boto3_client_fixture(mocker):
+    # patch the function bound by the module the evaluator is defined in
+    return mocker.patch(
+        f"{evaluator.BaseEvaluator.__module__}.get_shared_boto3_client"
+    )
+
 
+@pytest.fixture
+def evaluator_fixture(
+    mocker, test_fixture, target_fixture, get_shared_boto3_client_fixture
+):
     fixture = evaluator.Claude3Evaluator(
         aws_profile="test-profile",
         aws_region="us-west-2",
@@ -35,6 +45,7 @@ def evaluator_fixture(mocker, test_fixture, target_fixture):
         test=test_fixture,
         target=target_fixture,
         work_dir="test_dir",
+        script_name="agenteval.yml",
     )
 
     return fixture
@@ -56,6 +67,7 @@ class TestClaude3:
                 ["response", "thinking"],
                 ("test response", "test reasoning"),
             ),
+            ("<response>test response", ["response"], (None,)),
         ],
     )
     def test_extract_content_from_xml(
@@ -78,24 +90,110 @@ class TestClaude3:
         )
         mock_extract_content_from_xml.return_value = "test output", "test reasoning"
 
-        request_body = evaluator.model_configs.REQUEST_BODY
-        request_body["system"] = "test system prompt"
-        request_body["messages"][0]["content"][0]["text"] = "test prompt"
+        request_body = {
+            **evaluator.model_configs.REQUEST_BODY_STATIC,
+            "system": "test system prompt",
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [{"type": "text", "text": "test prompt"}],
+                }
+            ],
+        }
 
         result = evaluator_fixture._generate(
-            "test system prompt", "test prompt", "test_element_name"
+            "test system prompt",
+            "test prompt",
+            "test_element_name",
+            extract_reasoning=True,
         )
 
         assert result == ("test output", "test reasoning")
 
-        mock_invoke_model.assert_called_once_with(request_body=request_body)
+        mock_invoke_model.assert_called_once()
+        assert (
+            json.loads(mock_invoke_model.call_args.kwargs["request_body"])
+            == request_body
+        )
         mock_extract_content_from_xml.assert_called_once_with(
             "<test_element_name>test output/test_element_name> <thinking>test reasoning</thinking>",
             ["test_element_name", "thinking"],
         )
 
-    def test_run_single_turn_pass(self, mocker, evaluator_fixture):
-        mocker.patch.object(evaluator_fixture, "_invoke_target")
+    def test_generate_without_reasoning(self, mocker, evaluator_fixture):
+        mock_invoke_model = mocker.patch.object(evaluator_fixture, "invoke_model")
+
+        mock_invoke_model.return_value = {
+            "body": io.BytesIO(
+                b'{"content": [{"text": "<test_element_name>test output</test_element_name> <thinking>test reasoning</thinking>"}]}'
+            )
+        }
+
+        result = evaluator_fixture._generate(
+            "test system prompt", "test prompt", "test_element_name"
+        )
+
+        assert result == ("test output", None)
+
+    def test_generate_test_status_single_step(self, mocker, evaluator_fixture):
+        evaluator_fixture.test.steps = ["step 1"]
+        mock_generate = mocker.patch.object(evaluator_fixture, "_generate")
+
+        result = evaluator_fixture._generate_test_status()
+
+        assert result == evaluator.TestStatusCategories.ALL_STEPS_ATTEMPTED.value
+        mock_generate.assert_not_called()
+
+    def test_generate_evaluation_no_expected_results(
+        self, mocker, evaluator_fixture
+    ):
+        evaluator_fixture.test.expected_results = []
+        mock_generate = mocker.patch.object(evaluator_fixture, "_generate")
+
+        result = evaluator_fixture._generate_evaluation()
+
+        assert result == (
+            evaluator.EvaluationCategories.ALL_EXPECTED_RESULTS_OBSERVED.value,
+            "",
+        )
+        mock_generate.assert_not_called()
+
+    def test_retry_generate(self, mocker, evaluator_fixture):
+        mock_sleep = mocker.patch.object(evaluator.time, "sleep")
+        mock_generate = mocker.MagicMock(side_effect=[None, "test output"])
+
+        result = evaluator_fixture._retry_generate(mock_generate, "test output")
+
+        assert result == "test output"
+        assert mock_generate.call_count == 2
+        assert mock_sleep.call_count == 2
+        assert mock_sleep.call_args_list[0].args[0] < mock_sleep.call_args_list[1].args[0]
+
+    def test_retry_generate_exhausted(self, mocker, evaluator_fixture):
+        mock_sleep = mocker.patch.object(evaluator.time, "sleep")
+        mock_generate = mocker.MagicMock(return_value=None)
+
+        result = evaluator_fixture._retry_generate(mock_generate, "test output")
+
+        assert result is None
+        assert mock_generate.call_count == evaluator._MAX_RETRIES
+        assert all(
+            call.args[0] <= evaluator._RETRY_BACKOFF_CAP
+            for call in mock_sleep.call_args_list
+        )
+
+    def test_run_single_turn_pass(self, mocker, capsys, evaluator_fixture):
+        mock_invoke_target = mocker.patch.object(evaluator_fixture, "_invoke_target")
+        mock_invoke_target.return_value = "test agent response"
+
+        mock_request_user_response = mocker.patch.object(
+            evaluator_fixture, "_request_user_response"
+        )
+        mock_request_user_response.return_value = (
+            "test system prompt",
+            "test prompt",
+            "test user response",
+        )
 
         mock_generate_test_status = mocker.patch.object(
             evaluator_fixture, "_generate_test_status"
@@ -115,6 +213,65 @@ class TestClaude3:
         result = evaluator_fixture.evaluate()
 
         assert result.passed is True
+        out = capsys.readouterr().out
+        assert "USER:" in out and "test prompt" in out
+        assert "AGENT:" in out and "test agent response" in out
+        # the speculative user response is discarded and not traced
+        assert mock_request_user_response.call_count == 1
+        assert result.conversation.turns == 1
+        assert evaluator_fixture.trace.steps == []
+
+    def test_run_single_turn_waits_for_running_user_response(
+        self, mocker, evaluator_fixture
+    ):
+        mocker.patch.object(evaluator_fixture, "_invoke_target")
+
+        started = threading.Event()
+
+        def request_user_response():
+            started.set()
+            time.sleep(0.05)
+            evaluator_fixture._incr_token_counts(
+                {
+                    "ResponseMetadata": {
+                        "HTTPHeaders": {
+                            "x-amzn-bedrock-input-token-count": "10",
+                            "x-amzn-bedrock-output-token-count": "5",
+                        }
+                    }
+                }
+            )
+            return "test system prompt", "test prompt", "test user response"
+
+        mocker.patch.object(
+            evaluator_fixture,
+            "_request_user_response",
+            side_effect=request_user_response,
+        )
+
+        mock_generate_test_status = mocker.patch.object(
+            evaluator_fixture, "_generate_test_status"
+        )
+        # make sure the speculative call is in flight when all steps are attempted
+        mock_generate_test_status.side_effect = lambda: started.wait(5) and (
+            evaluator.TestStatusCategories.ALL_STEPS_ATTEMPTED.value
+        )
+
+        mock_generate_evaluation = mocker.patch.object(
+            evaluator_fixture, "_generate_evaluation"
+        )
+        mock_generate_evaluation.return_value = (
+            evaluator.EvaluationCategories.ALL_EXPECTED_RESULTS_OBSERVED.value,
+            "",
+        )
+
+        result = evaluator_fixture.evaluate()
+
+        assert result.passed is True
+        # the discarded response is not traced, but its tokens are counted
+        assert evaluator_fixture.trace.steps == []
+        assert evaluator_fixture.input_token_count == 10
+        assert evaluator_fixture.output_token_count == 5
 
     def test_run_single_turn_initial_prompt_pass(self, mocker, evaluator_fixture):
         evaluator_fixture.test.initial_prompt = None
@@ -125,6 +282,7 @@ class TestClaude3:
         mock_generate_initial_prompt.return_value = "test generated prompt"
 
         mocker.patch.object(evaluator_fixture, "_invoke_target")
+        mocker.patch.object(evaluator_fixture, "_request_user_response")
 
         mock_generate_test_status = mocker.patch.object(
             evaluator_fixture, "_generate_test_status"
@@ -149,10 +307,14 @@ class TestClaude3:
     def test_run_multi_turn_pass(self, mocker, evaluator_fixture):
         mocker.patch.object(evaluator_fixture, "_invoke_target")
 
-        mock_generate_user_response = mocker.patch.object(
-            evaluator_fixture, "_generate_user_response"
+        mock_request_user_response = mocker.patch.object(
+            evaluator_fixture, "_request_user_response"
+        )
+        mock_request_user_response.return_value = (
+            "test system prompt",
+            "test prompt",
+            "test user response",
         )
-        mock_generate_user_response.return_value = "test user response"
 
         mock_generate_test_status = mocker.patch.object(
             evaluator_fixture, "_generate_test_status"
@@ -174,7 +336,42 @@ class TestClaude3:
 
         assert result.passed is True
         assert mock_generate_test_status.call_count == 2
+        assert mock_request_user_response.call_count == 1
+        assert result.conversation.messages[2] == ("USER", "test user response")
+        assert [step["step_name"] for step in evaluator_fixture.trace.steps] == [
+            "_generate_user_response"
+        ]
+
+    def test_run_multi_turn_retry_user_response(self, mocker, evaluator_fixture):
+        mocker.patch.object(evaluator.time, "sleep")
+        mocker.patch.object(evaluator_fixture, "_invoke_target")
+
+        mock_request_user_response = mocker.patch.object(
+            evaluator_fixture, "_request_user_response"
+        )
+        mock_request_user_response.return_value = (
+            "test system prompt",
+            "test prompt",
+            None,
+        )
+
+        mock_generate_user_response = mocker.patch.object(
+            evaluator_fixture, "_generate_user_response"
+        )
+        mock_generate_user_response.return_value = "test user response"
+
+        mock_generate_test_status = mocker.patch.object(
+            evaluator_fixture, "_generate_test_status"
+        )
+        mock_generate_test_status.return_value = (
+            evaluator.TestStatusCategories.NOT_ALL_STEPS_ATTEMPTED.value
+        )
+
+        result = evaluator_fixture.evaluate()
+
+        assert result.passed is False
         assert mock_generate_user_response.call_count == 1
+        assert result.conversation.messages[2] == ("USER", "test user response")
 
     def test_run_max_turns_exceeded(self, mocker, evaluator_fixture):
         mocker.patch.object(evaluator_fixture, "_invoke_target")
@@ -187,12 +384,31 @@ class TestClaude3:
             evaluator.TestStatusCategories.NOT_ALL_STEPS_ATTEMPTED.value,
         ]
 
-        mock_generate_user_response = mocker.patch.object(
-            evaluator_fixture, "_generate_user_response"
+        mock_request_user_response = mocker.patch.object(
+            evaluator_fixture, "_request_user_response"
+        )
+        mock_request_user_response.return_value = (
+            "test system prompt",
+            "test prompt",
+            "test user response",
         )
-        mock_generate_user_response.return_value = "test user response"
 
         result = evaluator_fixture.evaluate()
 
         assert result.passed is False
-        assert mock_generate_user_response.call_count == 1
+        assert mock_request_user_response.call_count == 1
+
+    def test_init(self, evaluator_fixture, get_shared_boto3_client_fixture):
+        get_shared_boto3_client_fixture.assert_called_once_with(
+            boto3_service_name="bedrock-runtime",
+            aws_profile="test-profile",
+            aws_region="us-west-2",
+            endpoint_url=None,
+            max_retry=10,
+            max_pool_connections=defaults.MAX_POOL_CONNECTIONS,
+        )
+
+        assert (
+            evaluator_fixture.bedrock_runtime_client
+            is get_shared_boto3_client_fixture.return_value
+        )
@@ -30,3 +30,23 @@ class TestEvaluatorFactory:
         mock_evaluator_cls.assert_called_once_with(
             test=test, target=target, work_dir=work_dir, aws_region="us-west-2"
         )
+
+    def test_create_max_pool_connections(self, mocker):
+        factory = evaluator_factory.EvaluatorFactory(
+            config={"model": "claude-3"}, max_pool_connections=20
+        )
+        mock_evaluator_cls = mocker.patch.object(factory, "_get_evaluator_class")
+
+        test = mocker.MagicMock()
+        target = mocker.MagicMock()
+        work_dir = os.getcwd()
+
+        factory.create(test, target, work_dir, "agenteval.yml")
+
+        mock_evaluator_cls.return_value.assert_called_once_with(
+            test=test,
+            target=target,
+            work_dir=work_dir,
+            script_name="agenteval.yml",
+            max_pool_connections=20,
+        )
@@ -133,3 +133,27 @@ class TestPlan:
         mock_as_completed.assert_called_once_with(
             [mock_submit.return_value for _ in range(plan_fixture._num_tests)]
         )
+
+    def test_resolve_max_pool_connections(self, monkeypatch):
+        monkeypatch.delenv(plan._MAX_POOL_CONNECTIONS_ENV, raising=False)
+
+        assert plan.Plan._resolve_max_pool_connections(num_threads=100) == 200
+
+    def test_resolve_max_pool_connections_env(self, monkeypatch):
+        monkeypatch.setenv(plan._MAX_POOL_CONNECTIONS_ENV, "20")
+
+        assert plan.Plan._resolve_max_pool_connections(num_threads=100) == 20
+
+    @pytest.mark.parametrize("value", ["abc", "0", "-1"])
+    def test_resolve_max_pool_connections_invalid(self, monkeypatch, value):
+        monkeypatch.setenv(plan._MAX_POOL_CONNECTIONS_ENV, value)
+
+        with pytest.raises(plan.InvalidConfigurationError):
+            plan.Plan._resolve_max_pool_connections(num_threads=100)
+
+    def test_setup_run_max_pool_connections(self, monkeypatch, plan_fixture):
+        monkeypatch.delenv(plan._MAX_POOL_CONNECTIONS_ENV, raising=False)
+
+        plan_fixture._setup_run(None, None, 4)
+
+        assert plan_fixture._evaluator_factory.max_pool_connections == 8
@@ -0,0 +1,22 @@
+from src.agenteval.conversation import Conversation
+
+
+def test_add_turn():
+    conversation = Conversation()
+
+    conversation.add_turn("test user message 1", "test agent response 1")
+    conversation.add_turn("test user message 2", "test agent response 2")
+
+    assert conversation.turns == 2
+    assert list(conversation) == [
+        ("USER", "test user message 1"),
+        ("AGENT", "test agent response 1"),
+        ("USER", "test user message 2"),
+        ("AGENT", "test agent response 2"),
+    ]
+    assert conversation.transcript == (
+        "USER: test user message 1\n"
+        "AGENT: test agent response 1\n"
+        "USER: test user message 2\n"
+        "AGENT: test agent response 2\n"
+    )
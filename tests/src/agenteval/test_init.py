@@ -0,0 +1,33 @@
+import os
+
+from src import agenteval
+
+
+def test_get_jinja_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv(agenteval._CACHE_HOME_ENV, str(tmp_path))
+
+    assert agenteval.get_jinja_cache_dir() == os.path.join(
+        str(tmp_path), "agenteval", "jinja"
+    )
+
+
+def test_create_bytecode_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv(agenteval._CACHE_HOME_ENV, str(tmp_path))
+
+    bytecode_cache = agenteval.create_bytecode_cache()
+
+    assert bytecode_cache.directory == agenteval.get_jinja_cache_dir()
+
+
+def test_create_bytecode_cache_not_writable(mocker, monkeypatch, tmp_path):
+    monkeypatch.setenv(agenteval._CACHE_HOME_ENV, str(tmp_path))
+    mocker.patch.object(agenteval.os, "access", return_value=False)
+
+    assert agenteval.create_bytecode_cache() is None
+
+
+def test_create_bytecode_cache_makedirs_error(mocker, monkeypatch, tmp_path):
+    monkeypatch.setenv(agenteval._CACHE_HOME_ENV, str(tmp_path))
+    mocker.patch.object(agenteval.os, "makedirs", side_effect=PermissionError)
+
+    assert agenteval.create_bytecode_cache() is None
@@ -1,10 +1,11 @@
 from src.agenteval import summary
+import concurrent.futures
 import os
 
 
 def test_create_markdown_summary(mocker):
-    mock_get_template = mocker.patch.object(summary.jinja_env, "get_template")
-    mock_render = mocker.patch.object(mock_get_template.return_value, "render")
+    mock_template = mocker.patch.object(summary, "_TEMPLATE")
+    mock_render = mock_template.render
     mock_calculate_pass_rate_metric = mocker.patch.object(
         summary, "calculate_pass_rate_metric"
     )
@@ -12,9 +13,6 @@ def test_create_markdown_summary(mocker):
 
     summary.create_markdown_summary("test-work-dir", 10, 10, [], [])
 
-    mock_get_template.assert_called_once_with(
-        os.path.join(summary._TEMPLATE_ROOT, summary._TEMPLATE_FILE_NAME)
-    )
     mock_render.assert_called_once_with(
         tests=[],
         results=[],
@@ -25,3 +23,24 @@ def test_create_markdown_summary(mocker):
         os.path.join("test-work-dir", os.path.splitext(summary._TEMPLATE_FILE_NAME)[0]),
         mock_render.return_value,
     )
+
+
+def test_create_markdown_summaries(mocker):
+    mocker.patch.object(
+        summary.concurrent.futures,
+        "ProcessPoolExecutor",
+        concurrent.futures.ThreadPoolExecutor,
+    )
+    mock_create_markdown_summary = mocker.patch.object(
+        summary, "create_markdown_summary"
+    )
+
+    jobs = [
+        ("test-work-dir", 1, 2, [], [], "plan_a.yml"),
+        ("test-work-dir", 2, 2, [], [], "plan_b.yml"),
+    ]
+    summary.create_markdown_summaries(jobs, max_workers=2)
+
+    assert mock_create_markdown_summary.call_count == 2
+    mock_create_markdown_summary.assert_any_call(*jobs[0])
+    mock_create_markdown_summary.assert_any_call(*jobs[1])
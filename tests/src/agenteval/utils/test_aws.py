@@ -16,6 +16,8 @@ def test_create_boto3_client(mocker):
 
     mock_config.assert_called_once_with(
         retries={"max_attempts": 10, "mode": aws._RETRY_MODE},
+        max_pool_connections=aws._MAX_POOL_CONNECTIONS,
+        tcp_keepalive=False,
     )
 
     mock_session.assert_called_once_with(
@@ -25,3 +27,26 @@ def test_create_boto3_client(mocker):
     mock_client.assert_called_once_with(
         "test-service-name", endpoint_url=None, config=mock_config.return_value
     )
+
+
+def test_get_shared_boto3_client(mocker):
+    mocker.patch.dict(aws._shared_clients, clear=True)
+    mock_create_boto3_client = mocker.patch.object(aws, "create_boto3_client")
+
+    kwargs = {
+        "boto3_service_name": "test-service-name",
+        "aws_profile": "test-profile",
+        "aws_region": "us-west-2",
+        "endpoint_url": None,
+        "max_retry": 10,
+    }
+
+    client = aws.get_shared_boto3_client(**kwargs)
+    assert aws.get_shared_boto3_client(**kwargs) is client
+
+    mock_create_boto3_client.assert_called_once_with(
+        **kwargs, max_pool_connections=aws._MAX_POOL_CONNECTIONS, tcp_keepalive=True
+    )
+
+    aws.get_shared_boto3_client(**{**kwargs, "aws_region": "us-east-1"})
+    assert mock_create_boto3_client.call_count == 2